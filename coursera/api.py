@@ -386,7 +386,7 @@ class CourseraOnDemand(object):
     """
 
     def __init__(self, session, course_id, course_name,
-                 unrestricted_filenames=False):
+                 unrestricted_filenames=False, user_id=None):
         """
         Initialize Coursera OnDemand API.
 
@@ -400,23 +400,34 @@ class CourseraOnDemand(object):
             file names should endure stricter character filtering. @see
             `clean_filename` for the details.
         @type unrestricted_filenames: bool
+
+        @param user_id: User ID, if it is already known. Otherwise it can
+            be requested with `obtain_user_id`.
+        @type user_id: int
         """
         self._session = session
         self._course_id = course_id
         self._course_name = course_name
 
         self._unrestricted_filenames = unrestricted_filenames
-        self._user_id = None
+        self._user_id = user_id
 
         self._quiz_to_markup = QuizExamToMarkupConverter(session)
         self._markup_to_html = MarkupToHTMLConverter(session)
         self._asset_retriever = AssetRetriever(session)
 
     def obtain_user_id(self):
+        """
+        Request the ID of the current user and remember it.
+
+        @return: User ID or None if the user has no course memberships.
+        @rtype: int
+        """
         reply = get_page(self._session, OPENCOURSE_MEMBERSHIPS, json=True)
         elements = reply['elements']
         user_id = elements[0]['userId'] if elements else None
         self._user_id = user_id
+        return user_id
 
     def list_courses(self):
         """
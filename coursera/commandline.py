@@ -64,7 +64,8 @@ def parse_args(args=None):
                              default=1,
                              type=int,
                              help='number of parallel jobs to use for '
-                             'downloading resources. (Default: 1)')
+                             'parsing syllabus and downloading resources. '
+                             '(Default: 1)')
 
     group_basic.add_argument('--download-delay',
                              dest='download_delay',
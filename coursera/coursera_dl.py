@@ -57,6 +57,12 @@ from distutils.version import LooseVersion as V
 import bs4
 import six
 import requests
+from requests.adapters import DEFAULT_POOLSIZE
+
+try:  # Workaround for broken Debian/Ubuntu packages? (See issue #331)
+    from requests.packages.urllib3.util.retry import Retry
+except ImportError:
+    from urllib3.util.retry import Retry
 
 from .cookies import (
     AuthenticationFailed, ClassNotFound,
@@ -67,7 +73,7 @@ from .workflow import CourseraDownloader
 from .parallel import ConsecutiveDownloader, ParallelDownloader
 from .utils import (clean_filename, get_anchor_format, mkdir_p, fix_url,
                     print_ssl_error_message,
-                    decode_input, BeautifulSoup, is_debug_run)
+                    decode_input, BeautifulSoup, is_debug_run, spit_json)
 
 from .network import get_page, get_page_and_url
 from .commandline import parse_args
@@ -84,13 +90,22 @@ assert V(six.__version__) >= V('1.5'), "Upgrade six!" + _SEE_URL
 assert V(bs4.__version__) >= V('4.1'), "Upgrade bs4!" + _SEE_URL
 
 
-def get_session():
+def get_session(jobs=1):
     """
     Create a session with TLS v1.2 certificate.
+
+    The connection pool is large enough to keep a connection per thread
+    when `jobs` threads share the session, and failed connection attempts
+    are retried a few times before giving up.
+
+    @param jobs: Number of threads that will use the session.
+    @type jobs: int
     """
 
     session = requests.Session()
-    session.mount('https://', TLSAdapter())
+    adapter = TLSAdapter(pool_maxsize=max(jobs, DEFAULT_POOLSIZE),
+                         max_retries=Retry(total=3, backoff_factor=0.3))
+    session.mount('https://', adapter)
 
     return session
 
@@ -110,10 +125,16 @@ def list_courses(args):
         logging.info(course)
 
 
-def download_on_demand_class(args, class_name):
+def download_on_demand_class(session, extractor, args, class_name):
     """
     Download all requested resources from the on-demand class given in class_name.
 
+    @param session: Requests session, shared by all classes.
+    @type session: requests.Session
+
+    @param extractor: Logged in extractor, shared by all classes.
+    @type extractor: CourseraExtractor
+
     @return: Tuple of (bool, bool), where the first bool indicates whether
         errors occured while parsing syllabus, the second bool indicaters
         whether the course appears to be completed.
@@ -121,8 +142,6 @@ def download_on_demand_class(args, class_name):
     """
 
     error_occured = False
-    session = get_session()
-    extractor = CourseraExtractor(session, args.username, args.password)
 
     cached_syllabus_filename = '%s-syllabus-parsed.json' % class_name
     if args.cache_syllabus and os.path.isfile(cached_syllabus_filename):
@@ -135,11 +154,11 @@ def download_on_demand_class(args, class_name):
             args.unrestricted_filenames,
             args.subtitle_language,
             args.video_resolution,
-            args.download_quizzes)
+            args.download_quizzes,
+            args.jobs)
 
-    if is_debug_run or args.cache_syllabus():
-        with open(cached_syllabus_filename, 'w') as file_object:
-            json.dump(modules, file_object, indent=4)
+    if is_debug_run() or args.cache_syllabus:
+        spit_json(modules, cached_syllabus_filename)
 
     if args.only_syllabus:
         return error_occured, False
@@ -197,7 +216,7 @@ def print_failed_urls(failed_urls):
     logging.info('-' * 80)
 
 
-def download_class(args, class_name):
+def download_class(session, extractor, args, class_name):
     """
     Try to download on-demand class.
 
@@ -207,7 +226,7 @@ def download_class(args, class_name):
     @rtype: (bool, bool)
     """
     logging.debug('Downloading new style (on demand) class %s', class_name)
-    return download_on_demand_class(args, class_name)
+    return download_on_demand_class(session, extractor, args, class_name)
 
 
 def main():
@@ -228,11 +247,22 @@ def main():
         list_courses(args)
         return
 
+    # One session and extractor are shared by all classes, so that we log
+    # in once and reuse what the extractor has learned about the user.
+    # The extractor logs in inside the loop, so that login errors are
+    # reported (and retried with the next class) like any other error.
+    session = get_session(args.jobs)
+    extractor = None
+
     for class_index, class_name in enumerate(args.class_names):
         try:
             logging.info('Downloading class: %s (%d / %d)',
                          class_name, class_index + 1, len(args.class_names))
-            error_occured, completed = download_class(args, class_name)
+            if extractor is None:
+                extractor = CourseraExtractor(
+                    session, args.username, args.password)
+            error_occured, completed = download_class(
+                session, extractor, args, class_name)
             if completed:
                 completed_classes.append(class_name)
             if error_occured:
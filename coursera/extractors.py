@@ -8,12 +8,81 @@ to parse course syllabus.
 import abc
 import json
 import logging
+from collections import namedtuple
+from functools import partial
+from multiprocessing.dummy import Pool
+
+from six.moves import map, zip
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .api import CourseraOnDemand, OnDemandCourseMaterialItems
 from .define import OPENCOURSE_CONTENT_URL
 from .cookies import login
-from .network import get_page
-from .utils import is_debug_run
+from .network import get_reply
+from .utils import is_debug_run, spit_json
+
+
+# Parsed syllabus: a list of modules, each module is a list of sections,
+# each section is a list of lectures with their links. These are tuples,
+# so the syllabus can still be unpacked positionally and dumped to JSON.
+Module = namedtuple('Module', 'slug sections')
+Section = namedtuple('Section', 'slug lectures')
+Lecture = namedtuple('Lecture', 'slug links')
+
+# Lecture typenames that are only processed with `download_quizzes`
+QUIZ_TYPENAMES = frozenset(['quiz', 'exam'])
+
+
+def _loads_json(page):
+    """
+    Parse JSON page, preferably with orjson.
+
+    @param page: JSON document, either UTF-8 encoded or already decoded.
+    @type page: bytes or str
+
+    @return: Parsed document.
+    @rtype: dict
+    """
+    if orjson is not None:
+        return orjson.loads(page)
+
+    if isinstance(page, bytes):
+        page = page.decode('utf-8')
+    return json.loads(page)
+
+
+def _extract_links_from_item(handlers, lecture):
+    """
+    Extract links from a single item (lecture, supplement, quiz, ...) of
+    on-demand course syllabus. It is called from the pool threads and
+    keeps no state of its own.
+
+    @param handlers: Map of typename handlers.
+    @type handlers: @see CourseraExtractor._get_typename_handlers
+
+    @return: Dictionary of links (empty if there were no data), or None
+        if an error occured.
+    @rtype: dict or None
+    """
+    lecture_slug = lecture['slug']
+    typename = lecture['content']['typeName']
+
+    logging.info('Processing lecture         %s (%s)',
+                 lecture_slug, typename)
+
+    handler = handlers.get(typename)
+    if handler is None:
+        logging.info('Unsupported typename "%s" in lecture "%s"',
+                     typename, lecture_slug)
+        return {}
+
+    # Empty dictionary means there were no data
+    # None means an error occured
+    return handler(lecture)
 
 
 class PlatformExtractor(object):
@@ -31,6 +100,7 @@ class CourseraExtractor(PlatformExtractor):
         login(session, username, password)
 
         self._session = session
+        self._user_id = None
 
     def list_courses(self):
         """
@@ -47,22 +117,24 @@ class CourseraExtractor(PlatformExtractor):
     def get_modules(self, class_name,
                     reverse=False, unrestricted_filenames=False,
                     subtitle_language='en', video_resolution=None,
-                    download_quizzes=False):
+                    download_quizzes=False, jobs=1):
 
         page = self._get_on_demand_syllabus(class_name)
         error_occured, modules = self._parse_on_demand_syllabus(
             page, reverse, unrestricted_filenames,
             subtitle_language, video_resolution,
-            download_quizzes)
+            download_quizzes, jobs)
         return error_occured, modules
 
     def _get_on_demand_syllabus(self, class_name):
         """
-        Get the on-demand course listing webpage.
+        Get the on-demand course listing webpage. The page is returned
+        as raw bytes: it is JSON, so there is no need to detect its encoding
+        and decode it before parsing.
         """
 
         url = OPENCOURSE_CONTENT_URL.format(class_name=class_name)
-        page = get_page(self._session, url)
+        page = get_reply(self._session, url).content
         logging.info('Downloaded %s (%d bytes)', url, len(page))
 
         return page
@@ -71,17 +143,21 @@ class CourseraExtractor(PlatformExtractor):
                                   unrestricted_filenames=False,
                                   subtitle_language='en',
                                   video_resolution=None,
-                                  download_quizzes=False):
+                                  download_quizzes=False,
+                                  jobs=1):
         """
         Parse a Coursera on-demand course listing/syllabus page.
 
+        Links of all lectures of the course are extracted in `jobs` threads,
+        the order of lectures is preserved.
+
         @return: Tuple of (bool, list), where bool indicates whether
             there was at least on error while parsing syllabus, the list
             is a list of parsed modules.
         @rtype: (bool, list)
         """
 
-        dom = json.loads(page)
+        dom = _loads_json(page)
         course_name = dom['slug']
 
         logging.info('Parsing syllabus of on-demand course. '
@@ -90,28 +166,34 @@ class CourseraExtractor(PlatformExtractor):
         json_modules = dom['courseMaterial']['elements']
         course = CourseraOnDemand(session=self._session, course_id=dom['id'],
                                   course_name=course_name,
-                                  unrestricted_filenames=unrestricted_filenames)
-        course.obtain_user_id()
+                                  unrestricted_filenames=unrestricted_filenames,
+                                  user_id=self._user_id)
+        if self._user_id is None:
+            self._user_id = course.obtain_user_id()
         ondemand_material_items = OnDemandCourseMaterialItems.create(
             session=self._session, course_name=course_name)
 
         if is_debug_run():
-            with open('%s-syllabus-raw.json' % course_name, 'w') as file_object:
-                json.dump(dom, file_object, indent=4)
-            with open('%s-course-material-items.json' % course_name, 'w') as file_object:
-                json.dump(ondemand_material_items._items, file_object, indent=4)
-
-        error_occured = False
-
+            spit_json(dom, '%s-syllabus-raw.json' % course_name)
+            spit_json(ondemand_material_items._items,
+                      '%s-course-material-items.json' % course_name)
+
+        handlers = self._get_typename_handlers(
+            course, subtitle_language, video_resolution)
+        extract_links = partial(_extract_links_from_item, handlers)
+
+        # Lectures of these types are known, but were not asked for
+        skipped_typenames = frozenset() if download_quizzes else QUIZ_TYPENAMES
+
+        # Collect lectures of the whole course first, so that their links
+        # are extracted in parallel across sections rather than section by
+        # section
+        syllabus = []
+        all_lectures = []
         for module in json_modules:
-            module_slug = module['slug']
-            logging.info('Processing module  %s', module_slug)
             sections = []
             json_sections = module['elements']
             for section in json_sections:
-                section_slug = section['slug']
-                logging.info('Processing section     %s', section_slug)
-                lectures = []
                 json_lectures = section['elements']
 
                 # Certain modules may be empty-looking programming assignments
@@ -122,56 +204,104 @@ class CourseraExtractor(PlatformExtractor):
                     if lecture is not None:
                         json_lectures = [lecture]
 
-                for lecture in json_lectures:
-                    lecture_slug = lecture['slug']
-                    typename = lecture['content']['typeName']
-
-                    logging.info('Processing lecture         %s (%s)',
-                                 lecture_slug, typename)
-                    # Empty dictionary means there were no data
-                    # None means an error occured
-                    links = {}
-
-                    if typename == 'lecture':
-                        lecture_video_id = lecture['content']['definition']['videoId']
-                        assets = lecture['content']['definition'].get('assets', [])
-
-                        links = course.extract_links_from_lecture(
-                            lecture_video_id, subtitle_language,
-                            video_resolution, assets)
-
-                    elif typename == 'supplement':
-                        links = course.extract_links_from_supplement(
-                            lecture['id'])
-
-                    elif typename in ('gradedProgramming', 'ungradedProgramming'):
-                        links = course.extract_links_from_programming(lecture['id'])
-
-                    elif typename == 'quiz':
-                        if download_quizzes:
-                            links = course.extract_links_from_quiz(lecture['id'])
-
-                    elif typename == 'exam':
-                        if download_quizzes:
-                            links = course.extract_links_from_exam(lecture['id'])
-
-                    else:
-                        logging.info('Unsupported typename "%s" in lecture "%s"',
-                                     typename, lecture_slug)
-                        continue
-
-                    if links is None:
+                if skipped_typenames:
+                    json_lectures = [
+                        lecture for lecture in json_lectures
+                        if lecture['content']['typeName'] not in skipped_typenames]
+
+                sections.append((section['slug'], json_lectures))
+                all_lectures.extend(json_lectures)
+
+            syllabus.append((module['slug'], sections))
+
+        # Links are extracted lazily while the results are assembled below,
+        # so that progress is logged module by module, section by section.
+        # With a single job lectures are processed exactly in that order.
+        pool = Pool(processes=jobs) if jobs > 1 else None
+        try:
+            if pool is not None:
+                all_links = pool.imap(extract_links, all_lectures, chunksize=1)
+            else:
+                all_links = map(extract_links, all_lectures)
+
+            # Assemble the results back in the syllabus order. zip() stops at
+            # the end of json_lectures without consuming more links, so every
+            # section takes exactly its own links from the shared iterator.
+            error_occured = False
+            for module_slug, json_sections in syllabus:
+                logging.info('Processing module  %s', module_slug)
+                sections = []
+                for section_slug, json_lectures in json_sections:
+                    logging.info('Processing section     %s', section_slug)
+                    section_links = list(zip(json_lectures, all_links))
+                    if any(links is None for _, links in section_links):
                         error_occured = True
-                    elif links:
-                        lectures.append((lecture_slug, links))
-
-                if lectures:
-                    sections.append((section_slug, lectures))
-
-            if sections:
-                modules.append((module_slug, sections))
+                    lectures = [Lecture(lecture['slug'], links)
+                                for lecture, links in section_links
+                                if links]
+                    if lectures:
+                        sections.append(Section(section_slug, lectures))
+
+                if sections:
+                    modules.append(Module(module_slug, sections))
+        except BaseException:
+            # Do not let the workers send requests for the remaining
+            # lectures when parsing fails or is interrupted (Ctrl-C)
+            if pool is not None:
+                pool.terminate()
+            raise
+
+        if pool is not None:
+            pool.close()
+            pool.join()
 
         if modules and reverse:
             modules.reverse()
 
         return error_occured, modules
+
+    def _get_typename_handlers(self, course,
+                               subtitle_language='en',
+                               video_resolution=None):
+        """
+        Build a map from lecture typename to the function that extracts
+        links from lectures of that type.
+
+        @return: Dictionary of handlers. Each handler takes lecture JSON and
+            returns @see _extract_links_from_item
+        @rtype: {str: callable}
+        """
+        extract_links_from_lecture = course.extract_links_from_lecture
+        extract_links_from_supplement = course.extract_links_from_supplement
+        extract_links_from_programming = course.extract_links_from_programming
+        extract_links_from_quiz = course.extract_links_from_quiz
+        extract_links_from_exam = course.extract_links_from_exam
+
+        def lecture_handler(lecture):
+            definition = lecture['content']['definition']
+            return extract_links_from_lecture(
+                definition['videoId'], subtitle_language,
+                video_resolution, definition.get('assets', []))
+
+        def supplement_handler(lecture):
+            return extract_links_from_supplement(lecture['id'])
+
+        def programming_handler(lecture):
+            return extract_links_from_programming(lecture['id'])
+
+        def quiz_handler(lecture):
+            return extract_links_from_quiz(lecture['id'])
+
+        def exam_handler(lecture):
+            return extract_links_from_exam(lecture['id'])
+
+        handlers = {
+            'lecture': lecture_handler,
+            'supplement': supplement_handler,
+            'gradedProgramming': programming_handler,
+            'ungradedProgramming': programming_handler,
+            'quiz': quiz_handler,
+            'exam': exam_handler,
+        }
+
+        return handlers
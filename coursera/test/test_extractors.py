@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test syllabus extractors.
+"""
+import json
+import logging
+import time
+
+import pytest
+import requests
+from mock import patch, Mock
+
+from coursera import api
+from coursera import extractors
+
+
+SYLLABUS = {
+    'slug': 'test-course',
+    'id': '0',
+    'courseMaterial': {
+        'elements': [
+            {
+                'slug': 'module-1',
+                'elements': [
+                    {
+                        'slug': 'section-1',
+                        'id': 'lesson-1',
+                        'elements': [
+                            {'slug': 'lecture-%d' % index,
+                             'id': 'item-%d' % index,
+                             'content': {'typeName': 'supplement',
+                                         'definition': {}}}
+                            for index in range(10)
+                        ]
+                    }
+                ]
+            }
+        ]
+    }
+}
+
+
+@pytest.fixture
+def extractor():
+    with patch('coursera.extractors.login'):
+        return extractors.CourseraExtractor(Mock(), 'user', 'password')
+
+
+def extract_links_from_supplement(self, element_id):
+    if element_id == 'item-3':
+        return None
+    return {'html': [(element_id, '')]}
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+@patch.object(api.CourseraOnDemand, 'extract_links_from_supplement',
+              extract_links_from_supplement)
+@patch.object(api.CourseraOnDemand, 'obtain_user_id', Mock())
+@patch('coursera.api.OnDemandCourseMaterialItems.create',
+       Mock(return_value=api.OnDemandCourseMaterialItems([])))
+def test_parse_on_demand_syllabus_keeps_lecture_order(extractor, jobs):
+    error_occured, modules = extractor._parse_on_demand_syllabus(
+        json.dumps(SYLLABUS), jobs=jobs)
+
+    assert error_occured is True
+    [(module_slug, [(section_slug, lectures)])] = modules
+    assert module_slug == 'module-1'
+    assert section_slug == 'section-1'
+    assert [lecture.slug for lecture in lectures] == [
+        'lecture-%d' % index for index in range(10) if index != 3]
+    assert lectures[0].links == {'html': [('item-0', '')]}
+
+
+@patch.object(api.CourseraOnDemand, 'extract_links_from_supplement',
+              extract_links_from_supplement)
+@patch('coursera.api.OnDemandCourseMaterialItems.create',
+       Mock(return_value=api.OnDemandCourseMaterialItems([])))
+@patch('coursera.api.get_page')
+def test_user_id_is_requested_once(get_page, extractor):
+    get_page.return_value = {'elements': [{'userId': 42}]}
+
+    extractor._parse_on_demand_syllabus(json.dumps(SYLLABUS))
+    extractor._parse_on_demand_syllabus(json.dumps(SYLLABUS))
+
+    assert get_page.call_count == 1
+    assert extractor._user_id == 42
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+@pytest.mark.parametrize('page', [
+    b'{"slug": "\xd1\x82\xd0\xb5\xd1\x81\xd1\x82"}',
+    u'{"slug": "тест"}',
+])
+def test_loads_json(monkeypatch, use_orjson, page):
+    if use_orjson and extractors.orjson is None:
+        pytest.skip('orjson is not installed')
+    if not use_orjson:
+        monkeypatch.setattr(extractors, 'orjson', None)
+
+    assert extractors._loads_json(page) == {'slug': u'тест'}
+
+
+@patch.object(api.CourseraOnDemand, 'extract_links_from_supplement',
+              extract_links_from_supplement)
+@patch.object(api.CourseraOnDemand, 'obtain_user_id', Mock())
+@patch('coursera.api.OnDemandCourseMaterialItems.create',
+       Mock(return_value=api.OnDemandCourseMaterialItems([])))
+def test_parse_on_demand_syllabus_logs_progress_in_order(extractor, caplog):
+    caplog.set_level(logging.INFO)
+    extractor._parse_on_demand_syllabus(json.dumps(SYLLABUS), jobs=1)
+
+    messages = [record.getMessage().split()
+                for record in caplog.records
+                if record.getMessage().startswith('Processing')]
+    assert messages[:3] == [['Processing', 'module', 'module-1'],
+                            ['Processing', 'section', 'section-1'],
+                            ['Processing', 'lecture', 'lecture-0',
+                             '(supplement)']]
+    assert len(messages) == 12
+
+
+@patch.object(api.CourseraOnDemand, 'obtain_user_id', Mock())
+@patch('coursera.api.OnDemandCourseMaterialItems.create',
+       Mock(return_value=api.OnDemandCourseMaterialItems([])))
+def test_parse_on_demand_syllabus_stops_workers_on_error(extractor):
+    def extract(element_id):
+        if element_id == 'item-0':
+            raise requests.exceptions.ConnectionError(element_id)
+        time.sleep(0.1)
+        return {'html': [(element_id, '')]}
+
+    extract = Mock(side_effect=extract)
+    with patch.object(api.CourseraOnDemand, 'extract_links_from_supplement',
+                      extract):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            extractor._parse_on_demand_syllabus(json.dumps(SYLLABUS), jobs=4)
+
+        call_count = extract.call_count
+        time.sleep(0.3)
+
+    # Only the lectures that were already being processed were requested
+    assert extract.call_count == call_count
+    assert call_count < 10
@@ -8,6 +8,7 @@ import os
 import pytest
 import random
 import json
+from collections import namedtuple
 from time import time
 
 import requests
@@ -246,3 +247,22 @@ def test_extract_supplement_links(input, output):
     output = json.loads(json.dumps(output))
 
     assert expected_output == output
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_spit_json(tmpdir, monkeypatch, use_orjson):
+    if use_orjson and utils.orjson is None:
+        pytest.skip('orjson is not installed')
+    if not use_orjson:
+        monkeypatch.setattr(utils, 'orjson', None)
+
+    Pair = namedtuple('Pair', 'first second')
+    data = {'slug': 'test-course', 'elements': [1, 2.5, u'три', None],
+            'pair': Pair('a', ('b', 'c'))}
+    filename = str(tmpdir.join('test.json'))
+    utils.spit_json(data, filename)
+
+    with open(filename, 'rb') as file_object:
+        assert json.loads(file_object.read().decode('utf-8')) == {
+            'slug': 'test-course', 'elements': [1, 2.5, u'три', None],
+            'pair': ['a', ['b', 'c']]}
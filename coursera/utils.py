@@ -7,6 +7,7 @@ This module provides utility functions that are used within the script.
 import os
 import re
 import sys
+import json
 import time
 import errno
 import random
@@ -14,6 +15,10 @@ import string
 import logging
 import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from bs4 import BeautifulSoup as BeautifulSoup_
 from xml.sax.saxutils import escape, unescape
@@ -40,6 +45,10 @@ else:
 
 from .define import COURSERA_URL, WINDOWS_UNC_PREFIX
 
+# Characters allowed in file names, unless only minimal changes are requested
+VALID_FILENAME_CHARS = frozenset('-_.()%s%s' % (string.ascii_letters,
+                                                string.digits))
+
 # Force us of bs4 with html.parser
 BeautifulSoup = lambda page: BeautifulSoup_(page, 'html.parser')
 
@@ -65,6 +74,37 @@ def is_debug_run():
     return logging.getLogger().isEnabledFor(logging.DEBUG)
 
 
+def _orjson_default(obj):
+    """
+    Serialize objects unsupported by orjson the way json module does.
+    orjson refuses tuple subclasses (namedtuples), json writes them as lists.
+    """
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError('Type is not JSON serializable: %s' % type(obj).__name__)
+
+
+def spit_json(obj, filename):
+    """
+    Write object to a file in JSON format. orjson is used if it is
+    installed, because it is much faster on large objects such as
+    course syllabi.
+
+    @param obj: JSON-serializable object.
+    @type obj: object
+
+    @param filename: Name of the file to write to.
+    @type filename: str
+    """
+    if orjson is not None:
+        with open(filename, 'wb') as file_object:
+            file_object.write(orjson.dumps(obj, default=_orjson_default,
+                                           option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w') as file_object:
+            json.dump(obj, file_object, indent=4)
+
+
 def random_string(length):
     """
     Return a pseudo-random string of specified length.
@@ -120,8 +160,7 @@ def clean_filename(s, minimal_change=False):
     s = s.rstrip('.')  # Remove excess of trailing dots
 
     s = s.strip().replace(' ', '_')
-    valid_chars = '-_.()%s%s' % (string.ascii_letters, string.digits)
-    return ''.join(c for c in s if c in valid_chars)
+    return ''.join(c for c in s if c in VALID_FILENAME_CHARS)
 
 
 def normalize_path(path):